@@ -7,11 +7,75 @@ import torch
 import torch.nn as nn
 import torch.nn.functional as F
 from torch_geometric.nn import GCNConv, global_mean_pool
+from torch_geometric.nn.conv.gcn_conv import gcn_norm
 from torch_geometric.data import Data, Batch
 import numpy as np
-from typing import List, Tuple, Dict, Optional
+from dataclasses import dataclass
+from typing import List, NamedTuple, Tuple, Dict, Optional, Union
+import copy
 import json
 
+try:
+    from torch_scatter import segment_coo
+except ImportError:  # torch-scatter is optional
+    segment_coo = None
+
+
+class SortedGCNConv(GCNConv):
+    """
+    GCNConv with an aggregation specialised for destination-sorted edges
+    Uses segment_coo when the target index is sorted (always the case for
+    edges produced by RouteGNN.normalize_edges), otherwise index_add_.
+    """
+    
+    def aggregate(self, inputs, index, ptr=None, dim_size=None):
+        if dim_size is None:
+            dim_size = int(index.max()) + 1 if index.numel() > 0 else 0
+        
+        if segment_coo is not None and self._index_is_sorted(index):
+            return segment_coo(inputs, index, dim_size=dim_size, reduce='sum')
+        
+        out = inputs.new_zeros((dim_size,) + inputs.shape[1:])
+        return out.index_add_(0, index, inputs)
+    
+    @staticmethod
+    def _index_is_sorted(index) -> bool:
+        # The check needs a host sync, which is not allowed while capturing a
+        # CUDA graph and breaks torch.compile graphs; in both cases inputs
+        # always come from normalize_edges.
+        if torch.compiler.is_compiling():
+            return True
+        if index.is_cuda and torch.cuda.is_current_stream_capturing():
+            return True
+        return bool(torch.all(index[:-1] <= index[1:]))
+
+
+class RouteHead(nn.Module):
+    """
+    Readout MLP mapping pooled graph embeddings to route scores
+    Kept eager: torch.jit.script is deprecated and saves only ~7us per
+    call on CPU, against milliseconds for the full scoring pass.
+    """
+    
+    def __init__(self, hidden_dim: int = 64):
+        super(RouteHead, self).__init__()
+        
+        self.fc1 = nn.Linear(hidden_dim, 32)
+        self.fc2 = nn.Linear(32, 1)  # Route score
+        
+        self.dropout = nn.Dropout(0.2)
+        
+    def forward(self, x):
+        x = self.fc1(x)
+        x = F.relu(x)
+        x = self.dropout(x)
+        
+        return self.fc2(x)
+        
+    def _inference_forward(self, x):
+        """Eval-only forward with the dropout call removed"""
+        return self.fc2(F.relu(self.fc1(x)))
+
 
 class RouteGNN(nn.Module):
     """
@@ -25,18 +89,40 @@ class RouteGNN(nn.Module):
         self.node_features = node_features
         self.hidden_dim = hidden_dim
         
-        # Graph convolutional layers
-        self.conv1 = GCNConv(node_features, hidden_dim)
-        self.conv2 = GCNConv(hidden_dim, hidden_dim)
-        self.conv3 = GCNConv(hidden_dim, hidden_dim)
+        # Graph convolutional layers (edges are normalized once in forward)
+        self.conv1 = SortedGCNConv(node_features, hidden_dim, normalize=False)
+        self.conv2 = SortedGCNConv(hidden_dim, hidden_dim, normalize=False)
+        self.conv3 = SortedGCNConv(hidden_dim, hidden_dim, normalize=False)
         
         # Output layers for route scoring
-        self.fc1 = nn.Linear(hidden_dim, 32)
-        self.fc2 = nn.Linear(32, 1)  # Route score
+        self.head = RouteHead(hidden_dim)
         
         self.dropout = nn.Dropout(0.2)
         
-    def forward(self, x, edge_index, edge_attr, batch):
+        # The public register_load_state_dict_pre_hook needs torch>=2.5
+        self._register_load_state_dict_pre_hook(self._upgrade_state_dict)
+        
+    @staticmethod
+    def _upgrade_state_dict(state_dict, prefix, *args):
+        """Move fc1/fc2 keys from checkpoints saved before RouteHead under head."""
+        for key in [k for k in state_dict if k.startswith((prefix + 'fc1.', prefix + 'fc2.'))]:
+            state_dict[prefix + 'head.' + key[len(prefix):]] = state_dict.pop(key)
+        
+    @staticmethod
+    def normalize_edges(edge_index, num_nodes: int, dtype=None):
+        """
+        Add self-loops and compute symmetric GCN edge weights
+        Returns:
+            (edge_index, edge_weight) with self-loops, sorted by target node
+        """
+        edge_index, edge_weight = gcn_norm(edge_index, None, num_nodes, add_self_loops=True, dtype=dtype)
+        
+        # Sort by target so SortedGCNConv can use the segment reduction
+        perm = torch.argsort(edge_index[1], stable=True)
+        
+        return edge_index[:, perm], edge_weight[perm]
+        
+    def forward(self, x, edge_index, edge_attr, batch, num_graphs: Optional[int] = None):
         """
         Forward pass
         Args:
@@ -44,32 +130,86 @@ class RouteGNN(nn.Module):
             edge_index: Edge connectivity [2, num_edges]
             edge_attr: Edge features [num_edges, edge_features]
             batch: Batch assignment [num_nodes]
+            num_graphs: Number of graphs in the batch (inferred if None)
         Returns:
             Route scores [batch_size, 1]
         """
+        edge_index, edge_weight = self.normalize_edges(edge_index, x.size(0), x.dtype)
+        
+        return self.forward_normalized(x, edge_index, edge_weight, batch, num_graphs)
+        
+    def forward_normalized(self, x, edge_index, edge_weight, batch, num_graphs: Optional[int] = None):
+        """
+        Forward pass on edges already processed by normalize_edges
+        Performs no host synchronization when num_graphs is given, so it
+        can be captured in a CUDA graph.
+        """
         # Graph convolutions
-        x = self.conv1(x, edge_index)
+        x = self.conv1(x, edge_index, edge_weight)
         x = F.relu(x)
         x = self.dropout(x)
         
-        x = self.conv2(x, edge_index)
+        x = self.conv2(x, edge_index, edge_weight)
         x = F.relu(x)
         x = self.dropout(x)
         
-        x = self.conv3(x, edge_index)
+        x = self.conv3(x, edge_index, edge_weight)
         x = F.relu(x)
         
         # Global pooling
-        x = global_mean_pool(x, batch)
+        x = global_mean_pool(x, batch, num_graphs)
         
         # Output layers
-        x = self.fc1(x)
-        x = F.relu(x)
-        x = self.dropout(x)
+        return self.head(x)
+        
+    def _inference_forward(self, x, edge_index, edge_attr, batch, num_graphs: Optional[int] = None):
+        """
+        Eval-only forward pass: same as forward with the dropout calls removed
+        """
+        edge_index, edge_weight = self.normalize_edges(edge_index, x.size(0), x.dtype)
         
-        x = self.fc2(x)
+        return self._inference_forward_normalized(x, edge_index, edge_weight, batch, num_graphs)
         
-        return x
+    def _inference_forward_normalized(self, x, edge_index, edge_weight, batch, num_graphs: Optional[int] = None):
+        """
+        Eval-only forward_normalized with the dropout calls removed
+        """
+        x = F.relu(self.conv1(x, edge_index, edge_weight))
+        x = F.relu(self.conv2(x, edge_index, edge_weight))
+        x = F.relu(self.conv3(x, edge_index, edge_weight))
+        
+        x = global_mean_pool(x, batch, num_graphs)
+        
+        return self.head._inference_forward(x)
+
+
+def _next_power_of_two(n: int) -> int:
+    """Smallest power of two >= n"""
+    return 1 << max(n - 1, 0).bit_length()
+
+
+class _CapturedGraph(NamedTuple):
+    """A captured inference CUDA graph and its static input/output tensors"""
+    graph: torch.cuda.CUDAGraph
+    x: torch.Tensor
+    edge_index: torch.Tensor
+    edge_weight: torch.Tensor
+    batch: torch.Tensor
+    out: torch.Tensor
+
+
+@dataclass
+class TrainingBuffer:
+    """
+    Structure-of-arrays form of a training set
+    Graph i owns nodes node_offsets[i]:node_offsets[i+1] and edges
+    hop_offsets[i]:hop_offsets[i+1]; edge_index_cat holds global node indices.
+    """
+    hop_offsets: np.ndarray  # [num_graphs + 1]
+    edge_index_cat: np.ndarray  # [2, total_hops]
+    node_features_cat: np.ndarray  # [total_nodes, 16]
+    node_offsets: np.ndarray  # [num_graphs + 1]
+    labels: np.ndarray  # [num_graphs]
 
 
 class RouteOptimizer:
@@ -81,6 +221,24 @@ class RouteOptimizer:
         self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
         self.model = RouteGNN().to(self.device)
         
+        # Model used for scoring (a bfloat16 copy on capable GPUs), built
+        # lazily; see _get_inference_model and _invalidate_inference_model
+        self._inference_model = None
+        self._inference_weights_version = None
+        
+        # Mixed precision and compiled forward for GPU training; self.model
+        # keeps FP32 master weights. The scaler is only needed for float16.
+        # On CPU the model is too small for either to pay off.
+        if self.device.type == 'cuda':
+            self._amp_dtype = torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+        else:
+            self._amp_dtype = None
+        self._compiled_train_forward = None  # (module, compiled forward_normalized)
+        self._scaler = torch.amp.GradScaler(self.device.type, enabled=self._amp_dtype == torch.float16)
+        
+        # Captured CUDA graphs for inference, keyed by padded (num_nodes, num_edges)
+        self._graph_cache: Dict[Tuple[int, int], _CapturedGraph] = {}
+        
         if model_path:
             self.load_model(model_path)
         
@@ -93,11 +251,30 @@ class RouteOptimizer:
             'sentium': {'id': 4, 'avg_latency': 500, 'avg_cost': 10000, 'reliability': 0.99},
         }
         
+        # Precomputed chain feature table (one row per chain, ordered by id).
+        # The trailing zero row is used for unknown chains.
+        chains_sorted = sorted(self.chain_metadata, key=lambda c: self.chain_metadata[c]['id'])
+        ids = np.array([self.chain_metadata[c]['id'] for c in chains_sorted], dtype=np.int64)
+        rows = np.arange(len(chains_sorted))
+        
+        self._chain_feature_table = np.zeros((len(chains_sorted) + 1, 16), dtype=np.float32)
+        self._chain_feature_table[rows, 0] = ids / 10.0  # Normalized chain ID
+        self._chain_feature_table[rows, 1] = [self.chain_metadata[c]['avg_latency'] / 1000000.0 for c in chains_sorted]
+        self._chain_feature_table[rows, 2] = [self.chain_metadata[c]['avg_cost'] / 100000.0 for c in chains_sorted]
+        self._chain_feature_table[rows, 3] = [self.chain_metadata[c]['reliability'] for c in chains_sorted]
+        self._chain_feature_table[rows, 4 + ids] = 1.0  # One-hot chain type
+        
+        self._chain_to_row = {name: i for i, name in enumerate(chains_sorted)}
+        self._unknown_chain_row = len(chains_sorted)
+        
+        self._bridge_type_to_idx = {'Native': 0, 'Wrapped': 1, 'Liquidity': 2, 'Relay': 3}
+        
     def load_model(self, model_path: str):
         """Load pre-trained model"""
         checkpoint = torch.load(model_path, map_location=self.device)
         self.model.load_state_dict(checkpoint['model_state_dict'])
         self.model.eval()
+        self._invalidate_inference_model()
         
     def save_model(self, model_path: str):
         """Save model checkpoint"""
@@ -110,23 +287,8 @@ class RouteOptimizer:
         Encode chain as feature vector
         Returns: [16] feature vector
         """
-        if chain_name not in self.chain_metadata:
-            # Unknown chain - use default features
-            return np.zeros(16, dtype=np.float32)
-        
-        meta = self.chain_metadata[chain_name]
-        
-        # Create feature vector
-        features = np.zeros(16, dtype=np.float32)
-        features[0] = meta['id'] / 10.0  # Normalized chain ID
-        features[1] = meta['avg_latency'] / 1000000.0  # Normalized latency
-        features[2] = meta['avg_cost'] / 100000.0  # Normalized cost
-        features[3] = meta['reliability']
-        
-        # One-hot encoding for chain type (positions 4-8)
-        features[4 + meta['id']] = 1.0
-        
-        return features
+        row = self._chain_to_row.get(chain_name, self._unknown_chain_row)
+        return self._chain_feature_table[row].copy()
         
     def create_graph_from_route(self, route: Dict) -> Data:
         """
@@ -136,55 +298,248 @@ class RouteOptimizer:
         Returns:
             PyG Data object
         """
+        rows, edge_index, edge_attr = self._encode_route(route)
+        
+        # Node features (gathered from the precomputed table)
+        x = torch.from_numpy(self._chain_feature_table[rows])
+        
+        return Data(x=x, edge_index=torch.from_numpy(edge_index), edge_attr=torch.from_numpy(edge_attr))
+        
+    def _encode_route(self, route: Dict) -> Tuple[List[int], np.ndarray, np.ndarray]:
+        """
+        Encode a route as NumPy arrays
+        Returns:
+            (feature table row per node, edge_index [2, num_hops], edge_attr [num_hops, 6])
+        """
         hops = route['hops']
         
-        # Collect unique chains
-        chains = set()
-        for hop in hops:
-            chains.add(hop['from_chain'])
-            chains.add(hop['to_chain'])
+        num_hops = len(hops)
+        edge_index = np.empty((2, num_hops), dtype=np.int64)
+        edge_attr = np.empty((num_hops, 6), dtype=np.float32)
+        
+        # Nodes are numbered in first-seen order; rows index the feature table
+        chain_to_idx: Dict[str, int] = {}
+        rows: List[int] = []
+        
+        for i, hop in enumerate(hops):
+            for end, chain in enumerate((hop['from_chain'], hop['to_chain'])):
+                idx = chain_to_idx.get(chain)
+                if idx is None:
+                    idx = chain_to_idx[chain] = len(rows)
+                    rows.append(self._chain_to_row.get(chain, self._unknown_chain_row))
+                edge_index[end, i] = idx
+            
+            # Edge features: [cost, latency, bridge_type_onehot]
+            edge_attr[i, 0] = hop['cost'] / 100000.0  # Normalized cost
+            edge_attr[i, 1] = hop['time_ms'] / 1000000.0  # Normalized latency
+            
+            # Bridge type one-hot (4 types)
+            edge_attr[i, 2:6] = 0.0
+            bridge_idx = self._bridge_type_to_idx.get(hop['bridge_type'])
+            if bridge_idx is not None:
+                edge_attr[i, 2 + bridge_idx] = 1.0
         
-        chains = sorted(list(chains))
-        chain_to_idx = {chain: idx for idx, chain in enumerate(chains)}
+        return rows, edge_index, edge_attr
         
-        # Node features
-        node_features = []
-        for chain in chains:
-            features = self.encode_chain(chain)
-            node_features.append(features)
+    def build_training_buffer(self, training_data: List[Tuple[Dict, float]]) -> TrainingBuffer:
+        """
+        Pack a training set into a TrainingBuffer
+        Args:
+            training_data: List of (route, score) tuples
+        Returns:
+            TrainingBuffer with all graphs concatenated
+        """
+        rows, edge_indices = [], []
+        node_counts = np.empty(len(training_data), dtype=np.int64)
+        hop_counts = np.empty(len(training_data), dtype=np.int64)
+        
+        for i, (route, _) in enumerate(training_data):
+            route_rows, edge_index, _ = self._encode_route(route)
+            rows.extend(route_rows)
+            edge_indices.append(edge_index)
+            node_counts[i] = len(route_rows)
+            hop_counts[i] = edge_index.shape[1]
+        
+        node_offsets = np.zeros(len(training_data) + 1, dtype=np.int64)
+        np.cumsum(node_counts, out=node_offsets[1:])
+        hop_offsets = np.zeros(len(training_data) + 1, dtype=np.int64)
+        np.cumsum(hop_counts, out=hop_offsets[1:])
+        
+        # Shift each graph's local node indices by its node offset
+        edge_index_cat = np.concatenate(edge_indices, axis=1) if edge_indices else np.empty((2, 0), dtype=np.int64)
+        edge_index_cat += np.repeat(node_offsets[:-1], hop_counts)
+        
+        return TrainingBuffer(
+            hop_offsets=hop_offsets,
+            edge_index_cat=edge_index_cat,
+            node_features_cat=self._chain_feature_table[np.asarray(rows, dtype=np.int64)],
+            node_offsets=node_offsets,
+            labels=np.array([score for _, score in training_data], dtype=np.float32),
+        )
+        
+    def _to_device(self, data):
+        """
+        Move a tensor or Batch to the model device
+        On CUDA the host data is staged in pinned memory so the copy can
+        run asynchronously. Data already on a CUDA device is returned as is.
+        """
+        if self.device.type == 'cuda':
+            if data.is_cuda:
+                return data
+            return data.pin_memory().to(self.device, non_blocking=True)
+        return data.to(self.device)
         
-        x = torch.tensor(node_features, dtype=torch.float32)
+    def _build_graphs(self, routes: List[Dict]) -> List[Data]:
+        """Create one PyG graph per route"""
+        return [self.create_graph_from_route(route) for route in routes]
         
-        # Edge index and attributes
-        edge_index = []
-        edge_attr = []
+    def score_routes(self, routes: List[Dict]) -> np.ndarray:
+        """
+        Score several routes with a single batched GNN forward pass
+        Args:
+            routes: List of route dictionaries
+        Returns:
+            Scores [len(routes)] (higher is better)
+        """
+        return self._score_tensor(routes).cpu().numpy()
         
-        for hop in hops:
-            from_idx = chain_to_idx[hop['from_chain']]
-            to_idx = chain_to_idx[hop['to_chain']]
+    def _score_tensor(self, routes: List[Dict]) -> torch.Tensor:
+        """
+        Batched scoring that leaves the scores on the model device
+        Returns:
+            Scores [len(routes)] as a float32 tensor
+        """
+        # Scoring uses the dropout-free inference forward, so self.model's
+        # train/eval mode is left alone
+        with torch.inference_mode():
+            # Plain copy: normalize_edges needs the batch immediately, so a
+            # pinned async copy would have nothing to overlap with
+            batch = Batch.from_data_list(self._build_graphs(routes)).to(self.device)
             
-            edge_index.append([from_idx, to_idx])
+            if self.device.type == 'cuda':
+                scores = self._cuda_graph_forward(batch)
+            else:
+                scores = self._get_inference_model()._inference_forward(batch.x, batch.edge_index, batch.edge_attr, batch.batch, batch.num_graphs)
             
-            # Edge features: [cost, latency, bridge_type_onehot]
-            edge_features = [
-                hop['cost'] / 100000.0,  # Normalized cost
-                hop['time_ms'] / 1000000.0,  # Normalized latency
-            ]
+            return scores.squeeze(-1)
             
-            # Bridge type one-hot (4 types)
-            bridge_types = ['Native', 'Wrapped', 'Liquidity', 'Relay']
-            bridge_onehot = [0.0] * 4
-            if hop['bridge_type'] in bridge_types:
-                bridge_onehot[bridge_types.index(hop['bridge_type'])] = 1.0
-            edge_features.extend(bridge_onehot)
+    def _get_train_forward(self):
+        """
+        forward_normalized of the current self.model for training
+        On CUDA it is compiled, and recompiled if self.model is replaced.
+        """
+        if self.device.type != 'cuda':
+            return self.model.forward_normalized
+        
+        if self._compiled_train_forward is None or self._compiled_train_forward[0] is not self.model:
+            self._compiled_train_forward = (self.model, torch.compile(self.model.forward_normalized, dynamic=True))
+        
+        return self._compiled_train_forward[1]
+        
+    def _get_inference_model(self) -> RouteGNN:
+        """
+        Model used for scoring
+        On GPUs with bfloat16 support this is an eval-only bfloat16 copy;
+        otherwise it is self.model itself. Training always runs on the FP32
+        self.model. train and load_model drop the copy explicitly; in-place
+        edits that bump a tensor's version counter are also caught here, but
+        edits through .data are not (see _invalidate_inference_model).
+        """
+        version = self._weights_version()
+        if version != self._inference_weights_version:
+            self._invalidate_inference_model()
+            self._inference_weights_version = version
+        
+        if self._inference_model is None:
+            if self.device.type == 'cuda' and torch.cuda.is_bf16_supported():
+                self._inference_model = copy.deepcopy(self.model).eval().to(torch.bfloat16)
+            else:
+                self._inference_model = self.model
+        
+        return self._inference_model
+        
+    def _weights_version(self) -> Tuple[Tuple[int, int], ...]:
+        """Identity and in-place version counter of every self.model tensor"""
+        tensors = list(self.model.parameters()) + list(self.model.buffers())
+        return tuple((id(t), t._version) for t in tensors)
+        
+    def _invalidate_inference_model(self):
+        """
+        Drop the inference model and everything derived from it
+        Call this after changing self.model's weights outside train and
+        load_model (e.g. through p.data), otherwise GPU scoring may keep
+        using the old bfloat16 copy and captured CUDA graphs.
+        """
+        self._inference_model = None
+        self._graph_cache.clear()
+        
+    def _cuda_graph_forward(self, batch: Batch) -> torch.Tensor:
+        """
+        Run the inference forward through a captured CUDA graph
+        Inputs are padded to power-of-two node/edge counts so that a small
+        number of captured graphs covers all batch shapes. Padding nodes
+        belong to the last (never real) graph and padding edges are
+        zero-weight self-loops on the last node, so they do not affect real
+        scores.
+        Returns:
+            Route scores [num_graphs, 1]
+        """
+        num_nodes = batch.num_nodes
+        num_graphs = batch.num_graphs
+        
+        # Resolve the model first so stale captured graphs are dropped
+        model = self._get_inference_model()
+        
+        # Edge normalization uses data-dependent shapes, so it runs eagerly
+        edge_index, edge_weight = RouteGNN.normalize_edges(batch.edge_index, num_nodes, batch.x.dtype)
+        num_edges = edge_index.size(1)
+        
+        # At least one padding node; num_graphs < padded nodes always holds
+        padded_nodes = _next_power_of_two(num_nodes + 1)
+        padded_edges = _next_power_of_two(num_edges)
+        key = (padded_nodes, padded_edges)
+        
+        if key not in self._graph_cache:
+            dtype = next(model.parameters()).dtype
+            
+            # Static inputs use the model dtype; copy_ casts on refill
+            x_static = torch.zeros(padded_nodes, batch.x.size(1), dtype=dtype, device=self.device)
+            ei_static = torch.full((2, padded_edges), padded_nodes - 1, dtype=torch.long, device=self.device)
+            ew_static = torch.zeros(padded_edges, dtype=dtype, device=self.device)
+            batch_static = torch.full((padded_nodes,), padded_nodes - 1, dtype=torch.long, device=self.device)
+            
+            def run():
+                return model._inference_forward_normalized(x_static, ei_static, ew_static, batch_static, padded_nodes)
             
-            edge_attr.append(edge_features)
+            # Warm up on a side stream before capture
+            stream = torch.cuda.Stream()
+            stream.wait_stream(torch.cuda.current_stream())
+            with torch.cuda.stream(stream):
+                for _ in range(3):
+                    run()
+            torch.cuda.current_stream().wait_stream(stream)
+            
+            graph = torch.cuda.CUDAGraph()
+            with torch.cuda.graph(graph):
+                out_static = run()
+            
+            self._graph_cache[key] = _CapturedGraph(graph, x_static, ei_static, ew_static, batch_static, out_static)
+        
+        captured = self._graph_cache[key]
         
-        edge_index = torch.tensor(edge_index, dtype=torch.long).t().contiguous()
-        edge_attr = torch.tensor(edge_attr, dtype=torch.float32)
+        captured.x.zero_()
+        captured.x[:num_nodes].copy_(batch.x)
+        captured.edge_index.fill_(padded_nodes - 1)
+        captured.edge_index[:, :num_edges].copy_(edge_index)
+        captured.edge_weight.zero_()
+        captured.edge_weight[:num_edges].copy_(edge_weight)
+        captured.batch.fill_(padded_nodes - 1)
+        captured.batch[:num_nodes].copy_(batch.batch)
         
-        return Data(x=x, edge_index=edge_index, edge_attr=edge_attr)
+        captured.graph.replay()
         
+        return captured.out[:num_graphs].to(torch.float32, copy=True)
+            
     def score_route(self, route: Dict) -> float:
         """
         Score a route using the GNN model
@@ -193,18 +548,7 @@ class RouteOptimizer:
         Returns:
             Score (higher is better)
         """
-        self.model.eval()
-        
-        with torch.no_grad():
-            graph = self.create_graph_from_route(route)
-            graph = graph.to(self.device)
-            
-            # Create batch (single graph)
-            batch = torch.zeros(graph.x.size(0), dtype=torch.long, device=self.device)
-            
-            score = self.model(graph.x, graph.edge_index, graph.edge_attr, batch)
-            
-            return score.item()
+        return float(self.score_routes([route])[0])
             
     def optimize_route(self, routes: List[Dict]) -> Dict:
         """
@@ -220,16 +564,19 @@ class RouteOptimizer:
         if len(routes) == 1:
             return routes[0]
         
-        # Score all routes
-        scored_routes = []
-        for route in routes:
-            score = self.score_route(route)
-            scored_routes.append((score, route))
+        # Drop routes that are Pareto-dominated on cost, time and reliability;
+        # only the remaining front needs the GNN
+        front = pareto_front(routes)
+        candidates = [route for route, keep in zip(routes, front) if keep]
+        
+        if len(candidates) == 1:
+            return candidates[0]
         
-        # Sort by score (descending)
-        scored_routes.sort(key=lambda x: x[0], reverse=True)
+        # Score the remaining routes in one forward pass; only the index of
+        # the best one leaves the device
+        scores = self._score_tensor(candidates)
         
-        return scored_routes[0][1]
+        return candidates[int(torch.argmax(scores).item())]
         
     def train_step(self, batch_graphs: List[Data], labels: torch.Tensor) -> float:
         """
@@ -240,11 +587,12 @@ class RouteOptimizer:
         Returns:
             Loss value
         """
-        self.model.train()
+        if not self.model.training:
+            self.model.train()
         
         # Create batch
-        batch = Batch.from_data_list(batch_graphs).to(self.device)
-        labels = labels.to(self.device)
+        batch = self._to_device(Batch.from_data_list(batch_graphs))
+        labels = self._to_device(labels)
         
         # Forward pass
         predictions = self.model(batch.x, batch.edge_index, batch.edge_attr, batch.batch)
@@ -255,106 +603,230 @@ class RouteOptimizer:
         
         return loss.item()
         
-    def train(self, training_data: List[Tuple[Dict, float]], epochs: int = 100, lr: float = 0.001):
+    @staticmethod
+    def _gather_plan(
+        node_offsets: np.ndarray, edge_offsets: np.ndarray, graph_idx: np.ndarray
+    ) -> Tuple[np.ndarray, ...]:
+        """
+        Host-side gather indices for a minibatch of concatenated graphs
+        Args:
+            node_offsets: Node offsets per graph [num_graphs + 1]
+            edge_offsets: Edge offsets per graph [num_graphs + 1]
+            graph_idx: Indices of the graphs to select [k]
+        Returns:
+            (node_idx, edge_idx, edge_shift, batch); the minibatch is
+            x[node_idx] and edge_index[:, edge_idx] - edge_shift
+        """
+        node_start = node_offsets[graph_idx]
+        node_count = node_offsets[graph_idx + 1] - node_start
+        edge_start = edge_offsets[graph_idx]
+        edge_count = edge_offsets[graph_idx + 1] - edge_start
+        
+        # How far each graph moves when packed into the minibatch
+        node_shift = node_start - (np.cumsum(node_count) - node_count)
+        edge_move = edge_start - (np.cumsum(edge_count) - edge_count)
+        
+        node_idx = np.repeat(node_shift, node_count) + np.arange(node_count.sum())
+        edge_idx = np.repeat(edge_move, edge_count) + np.arange(edge_count.sum())
+        edge_shift = np.repeat(node_shift, edge_count)
+        batch = np.repeat(np.arange(len(graph_idx)), node_count)
+        
+        return node_idx, edge_idx, edge_shift, batch
+        
+    def train(
+        self,
+        training_data: List[Tuple[Dict, float]],
+        epochs: int = 100,
+        lr: float = 0.001,
+        seed: Optional[Union[int, np.random.Generator]] = None,
+    ):
         """
         Train the GNN model
         Args:
             training_data: List of (route, score) tuples
             epochs: Number of training epochs
             lr: Learning rate
+            seed: Seed or Generator for the minibatch shuffle (fresh entropy if None)
         """
         optimizer = torch.optim.Adam(self.model.parameters(), lr=lr)
+        train_forward = self._get_train_forward()
+        
+        # Set once for the whole run rather than per step
+        self.model.train()
+        
+        # Graphs are a pure function of the route; pack them once and move
+        # the concatenated arrays to the device
+        buffer = self.build_training_buffer(training_data)
+        num_graphs = len(buffer.labels)
+        node_counts = np.diff(buffer.node_offsets)
+        
+        x_all = self._to_device(torch.from_numpy(buffer.node_features_cat))
+        labels_all = self._to_device(torch.from_numpy(buffer.labels))
+        
+        # Edge normalization only depends on graph structure and the training
+        # set is a disjoint union, so normalize every graph once up front
+        edge_index_all, edge_weight_all = RouteGNN.normalize_edges(
+            self._to_device(torch.from_numpy(buffer.edge_index_cat)), len(buffer.node_features_cat)
+        )
+        edge_graph = np.repeat(np.arange(num_graphs), node_counts)[edge_index_all[1].cpu().numpy()]
+        edge_offsets = np.zeros(num_graphs + 1, dtype=np.int64)
+        np.cumsum(np.bincount(edge_graph, minlength=num_graphs), out=edge_offsets[1:])
+        
+        rng = np.random.default_rng(seed)
         
         for epoch in range(epochs):
-            total_loss = 0.0
+            total_loss = torch.zeros((), device=self.device)
             
-            # Create batches
+            # Shuffle once per epoch, then create batches
+            perm = rng.permutation(num_graphs)
             batch_size = 32
-            for i in range(0, len(training_data), batch_size):
-                batch_data = training_data[i:i+batch_size]
+            for i in range(0, num_graphs, batch_size):
+                graph_idx = perm[i:i+batch_size]
                 
-                # Prepare batch
-                graphs = [self.create_graph_from_route(route) for route, _ in batch_data]
-                labels = torch.tensor([score for _, score in batch_data], dtype=torch.float32)
+                # Prepare batch: indices are planned on the host so the device
+                # queue never waits on a sync and the next batch is prepared
+                # while the current one computes
+                node_idx, edge_idx, edge_shift, batch = (
+                    self._to_device(torch.from_numpy(a))
+                    for a in self._gather_plan(buffer.node_offsets, edge_offsets, graph_idx)
+                )
+                x = x_all[node_idx]
+                edge_index = edge_index_all[:, edge_idx] - edge_shift
+                edge_weight = edge_weight_all[edge_idx]
+                labels = labels_all[self._to_device(torch.from_numpy(graph_idx))]
                 
                 # Training step
                 optimizer.zero_grad()
                 
-                batch = Batch.from_data_list(graphs).to(self.device)
-                labels = labels.to(self.device)
-                
-                predictions = self.model(batch.x, batch.edge_index, batch.edge_attr, batch.batch)
-                predictions = predictions.squeeze()
+                with torch.autocast(self.device.type, dtype=self._amp_dtype, enabled=self._amp_dtype is not None):
+                    predictions = train_forward(x, edge_index, edge_weight, batch, len(graph_idx))
+                predictions = predictions.squeeze().float()
                 
                 loss = F.mse_loss(predictions, labels)
-                loss.backward()
-                optimizer.step()
+                self._scaler.scale(loss).backward()
+                self._scaler.step(optimizer)
+                self._scaler.update()
                 
-                total_loss += loss.item()
-            
-            avg_loss = total_loss / (len(training_data) / batch_size)
+                total_loss += loss.detach()
             
             if (epoch + 1) % 10 == 0:
+                avg_loss = total_loss.item() / (num_graphs / batch_size)
                 print(f"Epoch {epoch+1}/{epochs}, Loss: {avg_loss:.4f}")
+        
+        self._invalidate_inference_model()
 
 
-def cost_function(route: Dict) -> float:
+def cost_function_vec(
+    estimated_cost: Union[float, np.ndarray],
+    estimated_time_ms: Union[float, np.ndarray],
+    confidence_score: Union[float, np.ndarray],
+) -> Union[float, np.ndarray]:
     """
-    Calculate route cost
+    Calculate route cost for arrays (or scalars) of route fields
     Cost = w1*financial_cost + w2*time_cost + w3*reliability_penalty
     """
     w1, w2, w3 = 0.4, 0.3, 0.3
     
-    financial_cost = route['estimated_cost'] / 100000.0  # Normalize
-    time_cost = route['estimated_time_ms'] / 1000000.0  # Normalize
-    reliability_penalty = 1.0 - route['confidence_score']
+    financial_cost = estimated_cost / 100000.0  # Normalize
+    time_cost = estimated_time_ms / 1000000.0  # Normalize
+    reliability_penalty = 1.0 - confidence_score
+    
+    return w1 * financial_cost + w2 * time_cost + w3 * reliability_penalty
+
+
+def cost_function(route: Dict) -> float:
+    """
+    Calculate route cost
+    Cost = w1*financial_cost + w2*time_cost + w3*reliability_penalty
+    """
+    return cost_function_vec(route['estimated_cost'], route['estimated_time_ms'], route['confidence_score'])
+
+
+def pareto_front(routes: List[Dict]) -> np.ndarray:
+    """
+    Find routes not dominated on cost, time and reliability
+    A route is dominated if another route is at least as good on all three
+    and strictly better on at least one.
+    Returns:
+        Boolean mask [len(routes)], True for routes on the front
+    """
+    fin = np.array([route['estimated_cost'] for route in routes], dtype=np.float64)
+    tm = np.array([route['estimated_time_ms'] for route in routes], dtype=np.float64)
+    rel = np.array([route['confidence_score'] for route in routes], dtype=np.float64)
     
-    total_cost = w1 * financial_cost + w2 * time_cost + w3 * reliability_penalty
+    # dominates[j, i] is True when route j dominates route i
+    dominates = (
+        (fin[:, None] <= fin) & (tm[:, None] <= tm) & (rel[:, None] >= rel)
+        & ((fin[:, None] < fin) | (tm[:, None] < tm) | (rel[:, None] > rel))
+    )
     
-    return total_cost
+    return ~dominates.any(axis=0)
 
 
-def generate_training_data(num_samples: int = 1000) -> List[Tuple[Dict, float]]:
+def generate_training_data(
+    num_samples: int = 1000, seed: Optional[Union[int, np.random.Generator]] = None
+) -> List[Tuple[Dict, float]]:
     """
     Generate synthetic training data for the GNN
     In production, this would use real historical routing data
+    Args:
+        num_samples: Number of routes to generate
+        seed: Seed or Generator for reproducible data (fresh entropy if None)
     """
     training_data = []
     
     chains = ['ethereum', 'polkadot', 'bitcoin', 'cosmos', 'sentium']
     bridge_types = ['Native', 'Wrapped', 'Liquidity', 'Relay']
+    max_hops = 3
     
-    for _ in range(num_samples):
-        # Generate random route
-        num_hops = np.random.randint(1, 4)
-        hops = []
-        
-        current_chain = np.random.choice(chains)
-        for _ in range(num_hops):
-            next_chain = np.random.choice([c for c in chains if c != current_chain])
-            
-            hop = {
-                'from_chain': current_chain,
-                'to_chain': next_chain,
-                'bridge_type': np.random.choice(bridge_types),
-                'cost': np.random.randint(10000, 100000),
-                'time_ms': np.random.randint(1000, 60000),
+    # Draw every random value up front
+    rng = np.random.default_rng(seed)
+    num_hops = rng.integers(1, max_hops + 1, size=num_samples)
+    
+    # Chain path: a step of 1..len(chains)-1 never revisits the current chain
+    chain_path = np.empty((num_samples, max_hops + 1), dtype=np.int64)
+    chain_path[:, 0] = rng.integers(0, len(chains), size=num_samples)
+    steps = rng.integers(1, len(chains), size=(num_samples, max_hops))
+    chain_path[:, 1:] = (chain_path[:, :1] + np.cumsum(steps, axis=1)) % len(chains)
+    
+    bridge_idx = rng.integers(0, len(bridge_types), size=(num_samples, max_hops))
+    costs = rng.integers(10000, 100000, size=(num_samples, max_hops))
+    times = rng.integers(1000, 60000, size=(num_samples, max_hops))
+    confidences = rng.uniform(0.85, 0.99, size=num_samples)
+    
+    # Totals over the hops each route actually uses
+    hop_mask = np.arange(max_hops) < num_hops[:, None]
+    total_costs = (costs * hop_mask).sum(axis=1)
+    total_times = (times * hop_mask).sum(axis=1)
+    
+    # Calculate scores (inverse of cost - lower cost = higher score)
+    scores = 1.0 / (1.0 + cost_function_vec(total_costs, total_times, confidences))
+    
+    # Assemble route dicts from the precomputed arrays
+    for n, path, bridges, cost, time_ms, total_cost, total_time, confidence, score in zip(
+        num_hops.tolist(), chain_path.tolist(), bridge_idx.tolist(), costs.tolist(), times.tolist(),
+        total_costs.tolist(), total_times.tolist(), confidences.tolist(), scores.tolist(),
+    ):
+        hops = [
+            {
+                'from_chain': chains[path[h]],
+                'to_chain': chains[path[h + 1]],
+                'bridge_type': bridge_types[bridges[h]],
+                'cost': cost[h],
+                'time_ms': time_ms[h],
             }
-            hops.append(hop)
-            current_chain = next_chain
+            for h in range(n)
+        ]
         
         route = {
             'source_chain': hops[0]['from_chain'],
             'target_chain': hops[-1]['to_chain'],
             'hops': hops,
-            'estimated_cost': sum(h['cost'] for h in hops),
-            'estimated_time_ms': sum(h['time_ms'] for h in hops),
-            'confidence_score': np.random.uniform(0.85, 0.99),
+            'estimated_cost': total_cost,
+            'estimated_time_ms': total_time,
+            'confidence_score': confidence,
         }
         
-        # Calculate score (inverse of cost - lower cost = higher score)
-        score = 1.0 / (1.0 + cost_function(route))
-        
         training_data.append((route, score))
     
     return training_data